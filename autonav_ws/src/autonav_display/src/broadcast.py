@@ -2,6 +2,8 @@
 
 import rclpy
 from scr_core.node import Node
+from scr_core import SENSOR_QOS
+from scr_core.configuration import GET, SET, GET_ALL
 from scr_core.state import DeviceStateEnum
 from scr_msgs.msg import SystemState, DeviceState, Log, ConfigurationInstruction
 from scr_msgs.srv import SetSystemState
@@ -75,8 +77,8 @@ class BroadcastNode(Node):
 		self.motorControllerDebugSubscriber = self.create_subscription(MotorControllerDebug, "/autonav/MotorControllerDebug", self.motorControllerDebugCallback, 20)
 		self.objectDetectionSubscriber = self.create_subscription(ObjectDetection, "/autonav/ObjectDetection", self.objectDetectionCallback, 20)
 		self.pathingDebugSubscriber = self.create_subscription(PathingDebug, "/autonav/debug/astar", self.pathingDebugCallback, 20)
-		self.gpsFeedbackSubscriber = self.create_subscription(GPSFeedback, "/autonav/gps", self.gpsFeedbackCallback, 20)
-		self.imuDataSubscriber = self.create_subscription(IMUData, "/autonav/imu", self.imuDataCallback, 20)
+		self.gpsFeedbackSubscriber = self.create_subscription(GPSFeedback, "/autonav/gps", self.gpsFeedbackCallback, SENSOR_QOS)
+		self.imuDataSubscriber = self.create_subscription(IMUData, "/autonav/imu", self.imuDataCallback, SENSOR_QOS)
 		self.conbusSubscriber = self.create_subscription(Conbus, "/autonav/conbus/data", self.conbusCallback, 100)
 		self.conbusPublisher = self.create_publisher(Conbus, "/autonav/conbus/instruction", 100)
 
@@ -126,10 +128,18 @@ class BroadcastNode(Node):
 				self.broadcastPublisher.publish(Empty())
 
 			if obj["op"] == "configuration" and "device" in obj and "opcode" in obj:
+				# The page only issues requests, acks are left to the nodes themselves
+				if int(obj["opcode"]) not in (GET, SET, GET_ALL):
+					continue
+
+				data = obj["data"] if "data" in obj else []
+				if not isinstance(data, list) or not all(isinstance(b, int) and 0 <= b <= 255 for b in data):
+					continue
+
 				msg = ConfigurationInstruction()
 				msg.device = str(obj["device"])
 				msg.opcode = int(obj["opcode"])
-				msg.data = obj["data"] if "data" in obj else []
+				msg.data = data
 				msg.address = str(obj["address"]) if "address" in obj else ""
 				msg.iterator = int(obj["iterator"]) if "iterator" in obj else 0
 				self.configurationInstructionPublisher.publish(msg)
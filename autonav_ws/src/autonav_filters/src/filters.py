@@ -6,6 +6,7 @@ from particlefilter import ParticleFilter
 from deadrekt import DeadReckoningFilter
 from scr_msgs.msg import SystemState
 from scr_core.node import Node
+from scr_core import SENSOR_QOS
 from enum import IntEnum
 import rclpy
 import math
@@ -40,14 +41,19 @@ class FiltersNode(Node):
         self.config.setInt(CONFIG_FILTER_TYPE, self.declare_parameter("default_filter", 1).get_parameter_value().integer_value)
         self.config.setFloat(CONFIG_DEGREE_OFFSET, 107.0)
         self.config.setBool(CONFIG_SEED_HEADING, False)
+        self.filterType = self.config.getInt(CONFIG_FILTER_TYPE)
 
-        self.create_subscription(GPSFeedback, "/autonav/gps", self.onGPSReceived, 20)
-        self.create_subscription(IMUData, "/autonav/imu", self.onIMUReceived, 20);
+        self.create_subscription(GPSFeedback, "/autonav/gps", self.onGPSReceived, SENSOR_QOS)
+        self.create_subscription(IMUData, "/autonav/imu", self.onIMUReceived, SENSOR_QOS);
         self.create_subscription(MotorFeedback, "/autonav/MotorFeedback", self.onMotorFeedbackReceived, 20)
         self.positionPublisher = self.create_publisher(Position, "/autonav/position", 20)
 
         self.setDeviceState(DeviceStateEnum.OPERATING)
     
+    def onConfigurationChanged(self, address):
+        if address == CONFIG_FILTER_TYPE:
+            self.filterType = self.config.getInt(CONFIG_FILTER_TYPE)
+
     def onIMUReceived(self, msg: IMUData):
         self.lastIMUReceived = msg
         
@@ -82,14 +88,14 @@ class FiltersNode(Node):
 
         self.lastGps = msg
 
-        filterType = self.config.getInt(CONFIG_FILTER_TYPE)
+        filterType = self.filterType
         if filterType == FilterType.PARTICLE_FILTER:
             self.pf.gps(msg)
         elif filterType == FilterType.DEAD_RECKONING:
             self.reckoning.gps(msg)
 
     def onMotorFeedbackReceived(self, msg: MotorFeedback):
-        filterType = self.config.getInt(CONFIG_FILTER_TYPE)
+        filterType = self.filterType
         averages = None
         if filterType == FilterType.PARTICLE_FILTER:
             averages = self.pf.feedback(msg)
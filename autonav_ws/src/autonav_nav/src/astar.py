@@ -3,21 +3,23 @@
 from autonav_msgs.msg import Position, IMUData, PathingDebug, SafetyLights
 from scr_msgs.msg import SystemState
 from scr_core.node import Node
+from scr_core import SENSOR_QOS
 from scr_core.state import DeviceStateEnum, SystemStateEnum, SystemMode
-from geometry_msgs.msg import PoseStamped, Point
+from geometry_msgs.msg import PoseStamped
 from nav_msgs.msg import OccupancyGrid, Path
 import rclpy
+from rclpy.executors import MultiThreadedExecutor
 import math
-import copy
-from heapq import heappush, heappop
 from sensor_msgs.msg import CompressedImage
 import numpy as np
 import cv2
 import cv_bridge
 import time
+from numba import njit
 
 
 GRID_SIZE = 0.1
+MAP_RES = 80
 VERTICAL_CAMERA_DIST = 2.75
 HORIZONTAL_CAMERA_DIST = 3
 CV_BRIDGE = cv_bridge.CvBridge()
@@ -78,6 +80,109 @@ def toSafetyLights(autonomous: bool, eco: bool, mode: int, brightness: int, colo
     return pkg
 
 
+# A* scores are fixed point integers, one cell of distance is FIXED_POINT_SCALE
+FIXED_POINT_SCALE = 1024
+
+# 8-connected neighborhood (dx, dy, step length) searched by the A* kernel
+NEIGHBOR_DX = np.array([-1, -1, -1, 0, 0, 1, 1, 1], dtype=np.int32)
+NEIGHBOR_DY = np.array([-1, 0, 1, -1, 1, -1, 0, 1], dtype=np.int32)
+NEIGHBOR_DIST = np.round(np.sqrt(NEIGHBOR_DX ** 2 + NEIGHBOR_DY ** 2) * FIXED_POINT_SCALE).astype(np.int32)
+G_INFINITY = np.int32(np.iinfo(np.int32).max)
+
+# Cell coordinates and the forward-progress reward used when picking a goal
+GRID_Y, GRID_X = np.mgrid[0:MAP_RES, 0:MAP_RES]
+FORWARD_COST = (MAP_RES - GRID_Y) * 1.3
+
+# Obstacle-free cost map used when only following waypoints
+EMPTY_GRID = np.zeros((MAP_RES, MAP_RES), dtype=np.int8)
+EMPTY_GRID.flags.writeable = False
+
+
+@njit(cache=True)
+def _heap_push(heap_f, heap_i, size, f, i):
+    pos = size
+    while pos > 0:
+        parent = (pos - 1) >> 1
+        if heap_f[parent] <= f:
+            break
+        heap_f[pos] = heap_f[parent]
+        heap_i[pos] = heap_i[parent]
+        pos = parent
+    heap_f[pos] = f
+    heap_i[pos] = i
+    return size + 1
+
+
+@njit(cache=True)
+def _heap_pop(heap_f, heap_i, size):
+    top = heap_i[0]
+    size -= 1
+    last_f = heap_f[size]
+    last_i = heap_i[size]
+    pos = 0
+    while True:
+        child = 2 * pos + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap_f[child + 1] < heap_f[child]:
+            child += 1
+        if heap_f[child] >= last_f:
+            break
+        heap_f[pos] = heap_f[child]
+        heap_i[pos] = heap_i[child]
+        pos = child
+    heap_f[pos] = last_f
+    heap_i[pos] = last_i
+    return top, size
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _astar_njit(cost_map, h_table, sx, sy, gx, gy):
+    height, width = cost_map.shape
+    cells = height * width
+    start = sy * width + sx
+    goal = gy * width + gx
+
+    gScore = np.full(cells, G_INFINITY, np.int32)
+    came_from = np.full(cells, -1, np.int32)
+    closed = np.zeros(cells, np.bool_)
+
+    # Every cell is pushed at most once per neighbor, plus the start cell
+    heap_f = np.empty(cells * 8 + 1, np.int32)
+    heap_i = np.empty(cells * 8 + 1, np.int32)
+    heap_size = _heap_push(heap_f, heap_i, 0, np.int32(1), start)
+    gScore[start] = 0
+
+    while heap_size > 0:
+        current, heap_size = _heap_pop(heap_f, heap_i, heap_size)
+        if current == goal:
+            break
+        if closed[current]:
+            continue
+        closed[current] = True
+
+        cx = current % width
+        cy = current // width
+        for k in range(8):
+            nx = cx + NEIGHBOR_DX[k]
+            ny = cy + NEIGHBOR_DY[k]
+            if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                continue
+
+            neighbor = ny * width + nx
+            if closed[neighbor]:
+                continue
+
+            # Occupancy (0-100) costs a tenth of a cell per point
+            tentGScore = gScore[current] + NEIGHBOR_DIST[k] + cost_map[ny, nx] * FIXED_POINT_SCALE // 10
+            if tentGScore < gScore[neighbor]:
+                came_from[neighbor] = current
+                gScore[neighbor] = tentGScore
+                heap_size = _heap_push(heap_f, heap_i, heap_size, tentGScore + h_table[neighbor], neighbor)
+
+    return came_from
+
+
 class AStarNode(Node):
     def __init__(self):
         super().__init__("autonav_nav_astar")
@@ -87,9 +192,11 @@ class AStarNode(Node):
         self.longitudeLength = self.declare_parameter("longitude_length", 81978.2).get_parameter_value().double_value
 
     def configure(self):
-        self.configSpaceSubscriber = self.create_subscription(OccupancyGrid, "/autonav/cfg_space/expanded", self.onConfigSpaceReceived, 20)
-        self.poseSubscriber = self.create_subscription(Position, "/autonav/position", self.onPoseReceived, 20)
-        self.imuSubscriber = self.create_subscription(IMUData, "/autonav/imu", self.onImuReceived, 20)
+        # Goal selection and path search stay in the default group with the state and configuration
+        # callbacks, since onReset and recache swap out the state they read
+        self.configSpaceSubscriber = self.create_subscription(OccupancyGrid, "/autonav/cfg_space/expanded", self.onConfigSpaceReceived, SENSOR_QOS)
+        self.poseSubscriber = self.create_subscription(Position, "/autonav/position", self.onPoseReceived, SENSOR_QOS, callback_group=self.reentrantGroup)
+        self.imuSubscriber = self.create_subscription(IMUData, "/autonav/imu", self.onImuReceived, SENSOR_QOS, callback_group=self.reentrantGroup)
         self.debugPublisher = self.create_publisher(PathingDebug, "/autonav/debug/astar", 20)
         self.pathPublisher = self.create_publisher(Path, "/autonav/path", 20)
         self.safetyLightsPublisher = self.create_publisher(SafetyLights, "/autonav/SafetyLights", 20)
@@ -110,6 +217,11 @@ class AStarNode(Node):
         delta = (delta + math.pi) % (2 * math.pi) - math.pi
         return delta
 
+    def getOffsetToWaypoint(self, waypoint):
+        north = (waypoint[0] - self.position.latitude) * self.latitudeLength
+        west = (self.position.longitude - waypoint[1]) * self.longitudeLength
+        return north, west
+
     def onImuReceived(self, msg: IMUData):
         self.imu = msg
         
@@ -120,6 +232,8 @@ class AStarNode(Node):
         self.configSpace = None
         self.costMap = None
         self.bestPosition = (0, 0)
+        self.heuristicGoal = None
+        self.heuristicTable = None
         self.waypoints = []
         self.waypointTime = 0.0
 
@@ -143,7 +257,7 @@ class AStarNode(Node):
             return
         
         robot_pos = (40, 78)
-        path = self.findPathToPoint(robot_pos, self.bestPosition, self.costMap, 80, 80)
+        path = self.findPathToPoint(robot_pos, self.bestPosition, self.costMap)
         if path is not None:
             global_path = Path()
             global_path.poses = [self.pathToGlobalPose(pp[0], pp[1]) for pp in path]
@@ -151,10 +265,7 @@ class AStarNode(Node):
             self.pathPublisher.publish(global_path)
 
             # Draw the cost map onto a debug iamge
-            cvimg = np.zeros((80, 80), dtype=np.uint8)
-            for i in range(80):
-                for j in range(80):
-                    cvimg[i, j] = self.costMap[ i * 80 + j ] * 255
+            cvimg = self.costMap.astype(np.uint8) * 255
             cvimg = cv2.cvtColor(cvimg, cv2.COLOR_GRAY2RGB)
 
             for pp in path:
@@ -165,72 +276,31 @@ class AStarNode(Node):
             cvimg = cv2.resize(cvimg, (800, 800), interpolation=cv2.INTER_NEAREST)
             self.pathDebugImagePublisher.publish(CV_BRIDGE.cv2_to_compressed_imgmsg(cvimg))
             
-    def reconstructPath(self, path, current):
-        total_path = [current]
+    def reconstructPath(self, came_from, current, width):
+        total_path = [(current % width, current // width)]
 
-        while current in path:
-            current = path[current]
-            total_path.append(current)
+        while came_from[current] != -1:
+            current = int(came_from[current])
+            total_path.append((current % width, current // width))
 
         self.performance.end("A*")
         return total_path[::-1]
         
-    def findPathToPoint(self, start, goal, map, width, height):
-        looked_at = np.zeros((80, 80))
-        open_set = [start]
-        path = {}
-        search_dirs = []
-
+    def findPathToPoint(self, start, goal, cost_map):
+        height, width = cost_map.shape
         self.performance.start("A*")
 
-        for x in range(-1, 2):
-            for y in range(-1, 2):
-                if x == 0 and y == 0:
-                    continue
-                search_dirs.append((x,y,math.sqrt(x ** 2 + y ** 2)))
-
-        def h(point):
-            return math.sqrt((goal[0] - point[0]) ** 2 + (goal[1] - point[1]) ** 2)
-
-        def d(to_pt, dist):
-            return dist + map[to_pt[1] * width + to_pt[0]] / 10
-
-        gScore = {}
-        gScore[start] = 0
-
-        def getG(pt):
-            if pt in gScore:
-                return gScore[pt]
-            else:
-                gScore[pt] = 1000000000
-                return 1000000000 # Infinity
-
-        fScore = {}
-        fScore[start] = h(start)
-        next_current = [(1,start)]
-        while len(open_set) != 0:
-            current = heappop(next_current)[1]
-
-            looked_at[current[0],current[1]] = 1
-
-            if current == goal:
-                return self.reconstructPath(path, current)
-
-            open_set.remove(current)
-            for delta_x, delta_y, dist in search_dirs:
-
-                neighbor = (current[0] + delta_x, current[1] + delta_y)
-                if neighbor[0] < 0 or neighbor[0] >= width or neighbor[1] < 0 or neighbor[1] >= height:
-                    continue
-
-                tentGScore = getG(current) + d(neighbor, dist)
-                if tentGScore < getG(neighbor):
-                    path[neighbor] = current
-                    gScore[neighbor] = tentGScore
-                    fScore[neighbor] = tentGScore + h(neighbor)
-                    if neighbor not in open_set:
-                        open_set.append(neighbor)
-                        heappush(next_current, (fScore[neighbor], neighbor))
+        # The goal only moves when a new config space arrives, so cache the distance to it per cell
+        if goal != self.heuristicGoal:
+            self.heuristicTable = np.round(np.hypot(np.arange(width)[None, :] - goal[0], np.arange(height)[:, None] - goal[1]) * FIXED_POINT_SCALE).astype(np.int32).ravel()
+            self.heuristicGoal = goal
+
+        came_from = _astar_njit(cost_map, self.heuristicTable, start[0], start[1], goal[0], goal[1])
+        goal_index = goal[1] * width + goal[0]
+        if goal != start and came_from[goal_index] == -1:
+            return None
+
+        return self.reconstructPath(came_from, goal_index, width)
                     
     def onConfigSpaceReceived(self, msg: OccupancyGrid):
         if self.position is None or self.getSystemState().state != SystemStateEnum.AUTONOMOUS:
@@ -238,16 +308,9 @@ class AStarNode(Node):
 
         self.performance.start("Smellification")
 
-        grid_data = msg.data
-        temp_best_pos = (40, 78)
-        best_pos_cost = -1000
-
-        frontier = set()
-        frontier.add((40, 78))
-        explored = set()
-
-        if self.config.getBool(CONFIG_USE_ONLY_WAYPOINTS) == True:
-            grid_data = [0] * len(msg.data)
+        use_only_waypoints = self.config.getBool(CONFIG_USE_ONLY_WAYPOINTS)
+        # rclpy hands int8[] fields over as array.array('b'), which numpy can view without copying
+        grid = EMPTY_GRID if use_only_waypoints else np.frombuffer(msg.data, dtype=np.int8).reshape(MAP_RES, MAP_RES)
             
         if len(self.waypoints) == 0 and time.time() > self.waypointTime and self.waypointTime != 0:
             self.waypoints = [wp for wp in self.getWaypointsForDirection()]
@@ -266,20 +329,28 @@ class AStarNode(Node):
 
         if len(self.waypoints) > 0:
             next_waypoint = self.waypoints[0]
-            north_to_gps = (next_waypoint[0] - self.position.latitude) * self.latitudeLength
-            west_to_gps = (self.position.longitude - next_waypoint[1]) * self.longitudeLength
-            heading_to_gps = math.atan2(west_to_gps, north_to_gps) % (2 * math.pi)
+            north_to_gps, west_to_gps = self.getOffsetToWaypoint(next_waypoint)
+            distance_sq_to_gps = north_to_gps * north_to_gps + west_to_gps * west_to_gps
 
-            if north_to_gps ** 2 + west_to_gps ** 2 <= self.config.getFloat(CONFIG_WAYPOINT_POP_DISTANCE):
+            if distance_sq_to_gps <= self.config.getFloat(CONFIG_WAYPOINT_POP_DISTANCE):
                 self.waypoints.pop(0)
                 self.safetyLightsPublisher.publish(toSafetyLights(True, False, 2, 255, "#00FF00"))
                 self.resetWhen = time.time() + 1.5
 
+                # Only a pop changes the target, so only then is the offset stale
+                if len(self.waypoints) > 0:
+                    next_waypoint = self.waypoints[0]
+                    north_to_gps, west_to_gps = self.getOffsetToWaypoint(next_waypoint)
+                    distance_sq_to_gps = north_to_gps * north_to_gps + west_to_gps * west_to_gps
+
+            # Still published after the last pop so the display sees the emptied waypoint list
+            heading_to_gps = math.atan2(west_to_gps, north_to_gps) % (2 * math.pi)
+
             pathingDebug = PathingDebug()
             pathingDebug.desired_heading = heading_to_gps
             pathingDebug.desired_latitude = next_waypoint[0]
             pathingDebug.desired_longitude = next_waypoint[1]
-            pathingDebug.distance_to_destination = north_to_gps ** 2 + west_to_gps ** 2
+            pathingDebug.distance_to_destination = distance_sq_to_gps
             wp1d = []
             for wp in self.waypoints:
                 wp1d.append(wp[0])
@@ -287,56 +358,57 @@ class AStarNode(Node):
             pathingDebug.waypoints = wp1d
             self.debugPublisher.publish(pathingDebug)
 
-        depth = 0
-        while depth < 50 and len(frontier) > 0:
-            curfrontier = copy.copy(frontier)
-            for pos in curfrontier:
-                x = pos[0]
-                y = pos[1]
-                cost = (80 - y) * 1.3 + depth * 2.2
-
-                if len(self.waypoints) > 0:
-                    heading_err_to_gps = abs(self.getAngleDifference(self.position.theta + math.atan2(40 - x, 80 - y), heading_to_gps)) * 180 / math.pi
-                    cost -= max(heading_err_to_gps, 10)
-
-                if cost > best_pos_cost:
-                    best_pos_cost = cost
-                    temp_best_pos = pos
-
-                frontier.remove(pos)
-                explored.add(x + 80 * y)
+        passable = None if use_only_waypoints else grid < 50
 
-                if y > 1 and grid_data[x + 80 * (y-1)] < 50 and x + 80 * (y-1) not in explored:
-                    frontier.add((x, y - 1))
-
-                if x < 79 and grid_data[x + 1 + 80 * y] < 50 and x + 1 + 80 * y not in explored:
-                    frontier.add((x + 1, y))
+        # Cost of ending up at each cell, excluding the depth it was reached at
+        base_cost = FORWARD_COST
+        if len(self.waypoints) > 0:
+            heading_err_to_gps = np.abs(self.getAngleDifference(self.position.theta + np.arctan2(40 - GRID_X, 80 - GRID_Y), heading_to_gps)) * 180 / math.pi
+            base_cost = base_cost - np.maximum(heading_err_to_gps, 10)
 
-                if x > 0 and grid_data[x - 1 + 80 * y] < 50 and x - 1 + 80 * y not in explored:
-                    frontier.add((x - 1, y))
+        frontier = np.zeros((MAP_RES, MAP_RES), dtype=bool)
+        frontier[78, 40] = True
+        explored = np.zeros((MAP_RES, MAP_RES), dtype=bool)
+        reached_depth = np.zeros((MAP_RES, MAP_RES), dtype=np.float32)
 
+        depth = 0
+        while depth < 50 and frontier.any():
+            reached_depth[frontier] = depth
+            explored |= frontier
+
+            # Expand up (never into the top row), right and left
+            expanded = np.zeros((MAP_RES, MAP_RES), dtype=bool)
+            expanded[1:-1, :] |= frontier[2:, :]
+            expanded[:, 1:] |= frontier[:, :-1]
+            expanded[:, :-1] |= frontier[:, 1:]
+            frontier = expanded & ~explored
+            if passable is not None:
+                frontier &= passable
             depth += 1
 
-        self.costMap = grid_data
+        cost = np.where(explored, base_cost + reached_depth * 2.2, -np.inf)
+        best = int(np.argmax(cost))
+        temp_best_pos = (best % MAP_RES, best // MAP_RES)
+
+        self.costMap = grid
         self.bestPosition = temp_best_pos
         self.performance.end("Smellification")
         
     def pathToGlobalPose(self, pp0, pp1):
+        # Paths stay in the robot frame, so there is no rotation to apply
         x = (80 - pp1) * VERTICAL_CAMERA_DIST / 80
         y = (40 - pp0) * HORIZONTAL_CAMERA_DIST / 80
-        
-        new_x = x * math.cos(0) + y * math.sin(0) 
-        new_y = x * math.sin(0) + y * math.cos(0)
+
         pose = PoseStamped()
-        point = Point()
-        point.x = new_x
-        point.y = new_y
-        pose.pose.position = point
+        pose.pose.position.x = x
+        pose.pose.position.y = y
         return pose
 
 def main():
     rclpy.init()
-    rclpy.spin(AStarNode())
+    executor = MultiThreadedExecutor(num_threads=4)
+    executor.add_node(AStarNode())
+    executor.spin()
     rclpy.shutdown()
 
 
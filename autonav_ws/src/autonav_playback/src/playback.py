@@ -5,6 +5,7 @@ from scr_core.state import DeviceStateEnum, SystemStateEnum, SystemMode
 from sensor_msgs.msg import CompressedImage
 from scr_msgs.msg import SystemState, DeviceState
 from scr_core.node import Node
+from scr_core import SENSOR_QOS
 from datetime import datetime
 import shutil
 import rclpy
@@ -55,8 +56,8 @@ class PlaybackNode(Node):
         self.config.setBool(CONFIG_RECORD_EXPANDIFIED, True)
         self.config.setBool(CONFIG_RECORD_THRESHOLDED, True)
         
-        self.imuSubscriber = self.create_subscription(IMUData, "/autonav/imu", self.imuCallback, 20)
-        self.gpsSubscriber = self.create_subscription(GPSFeedback, "/autonav/gps", self.gpsCallback, 20)
+        self.imuSubscriber = self.create_subscription(IMUData, "/autonav/imu", self.imuCallback, SENSOR_QOS)
+        self.gpsSubscriber = self.create_subscription(GPSFeedback, "/autonav/gps", self.gpsCallback, SENSOR_QOS)
         self.feedbackSubscriber = self.create_subscription(MotorFeedback, "/autonav/MotorFeedback", self.feedbackCallback, 20)
         self.inputSubscriber = self.create_subscription(MotorInput, "/autonav/MotorInput", self.inputCallback, 20)
         self.positionSubscriber = self.create_subscription(Position, "/autonav/position", self.positionCallback, 20)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import rclpy
+from rclpy.executors import MultiThreadedExecutor
 import time
 import os
 import threading
@@ -8,6 +9,7 @@ from vnpy import *
 from autonav_msgs.msg import IMUData
 from autonav_msgs.msg import GPSFeedback
 from scr_core.node import Node
+from scr_core import SENSOR_QOS
 from scr_core.state import DeviceStateEnum, SystemStateEnum
 
 IMU_READ_RATE = "imu_read_rate"
@@ -21,9 +23,10 @@ class IMUNode(Node):
         self.vectorNavSensor = VnSensor()
 
         self.config.setFloat(IMU_READ_RATE, 0.1)
+        self.readRate = self.config.getFloat(IMU_READ_RATE)
 
-        self.imuPublisher = self.create_publisher(IMUData, "/autonav/imu", 20)
-        self.gpsPublisher = self.create_publisher(GPSFeedback, "/autonav/gps", 20)
+        self.imuPublisher = self.create_publisher(IMUData, "/autonav/imu", SENSOR_QOS)
+        self.gpsPublisher = self.create_publisher(GPSFeedback, "/autonav/gps", SENSOR_QOS)
 
         self.imuThread = threading.Thread(target=self.imuWorker)
         self.imuThread.daemon = True
@@ -32,6 +35,10 @@ class IMUNode(Node):
     def transition(self, old, updated):
         return
 
+    def onConfigurationChanged(self, address):
+        if address == IMU_READ_RATE:
+            self.readRate = self.config.getFloat(IMU_READ_RATE)
+
     def imuWorker(self):
         while rclpy.ok() and self.getSystemState().state != SystemStateEnum.SHUTDOWN:
             if (not self.vectorNavSensor.is_connected):
@@ -53,6 +60,7 @@ class IMUNode(Node):
                 continue
 
             if self.getDeviceState() != DeviceStateEnum.OPERATING:
+                time.sleep(self.readRate)
                 continue
 
             acceleration = self.vectorNavSensor.read_acceleration_measurements()
@@ -79,12 +87,14 @@ class IMUNode(Node):
             gps.gps_fix = sensor_register.gps_fix
             gps.satellites = sensor_register.num_sats
             self.gpsPublisher.publish(gps)
-            time.sleep(self.config.getFloat(IMU_READ_RATE))
+            time.sleep(self.readRate)
 
 
 def main():
     rclpy.init()
-    rclpy.spin(IMUNode())
+    executor = MultiThreadedExecutor(num_threads=4)
+    executor.add_node(IMUNode())
+    executor.spin()
     rclpy.shutdown()
 
 
@@ -72,7 +72,8 @@ namespace SCR
                 SET = 1,
                 GET_ACK = 2,
                 SET_ACK = 3,
-                GET_ALL = 4
+                GET_ALL = 4,
+                GET_ALL_ACK = 5
             };
     };
 }
\ No newline at end of file
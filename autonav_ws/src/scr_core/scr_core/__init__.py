@@ -1,2 +1,9 @@
+from rclpy.qos import QoSProfile, ReliabilityPolicy, HistoryPolicy
+
+
+# Periodic sensor streams only care about the newest sample
+SENSOR_QOS = QoSProfile(reliability=ReliabilityPolicy.BEST_EFFORT, history=HistoryPolicy.KEEP_LAST, depth=1)
+
+
 def clamp(n, minn, maxn):
     return max(min(maxn, n), minn)
@@ -8,12 +8,68 @@ SET = 1
 GET_ACK = 2
 SET_ACK = 3
 GET_ALL = 4
+GET_ALL_ACK = 5
+
+REGISTER_LENGTH = struct.Struct('>H')
+INT_FORMAT = struct.Struct('>i')
+FLOAT_FORMAT = struct.Struct('f')
+BOOL_TRUE = bytes([True])
+BOOL_FALSE = bytes([False])
+
+
+def packRegisters(registers: dict) -> bytes:
+    # GET_ALL_ACK payload, repeated per register: [address length:u16][address][data length:u16][data]
+    payload = bytearray()
+    for address, data in registers.items():
+        encoded = address.encode()
+        payload += REGISTER_LENGTH.pack(len(encoded))
+        payload += encoded
+        payload += REGISTER_LENGTH.pack(len(data))
+        payload += data
+    return bytes(payload)
+
+
+def unpackRegisters(payload) -> dict:
+    # Returns None if the payload is truncated or an address is not valid UTF-8
+    payload = bytes(payload)
+    registers = {}
+    offset = 0
+    while offset < len(payload):
+        if offset + REGISTER_LENGTH.size > len(payload):
+            return None
+        length = REGISTER_LENGTH.unpack_from(payload, offset)[0]
+        offset += REGISTER_LENGTH.size
+        if offset + length > len(payload):
+            return None
+        try:
+            address = payload[offset:offset + length].decode()
+        except UnicodeDecodeError:
+            return None
+        offset += length
+
+        if offset + REGISTER_LENGTH.size > len(payload):
+            return None
+        length = REGISTER_LENGTH.unpack_from(payload, offset)[0]
+        offset += REGISTER_LENGTH.size
+        if offset + length > len(payload):
+            return None
+        registers[address] = payload[offset:offset + length]
+        offset += length
+    return registers
 
 
 class Configuration:
     def __init__(self, id: str, node: Node):
         self.id = id.replace("/", "")
         self.node = node
+        self.handlers = {
+            GET: self.onGet,
+            SET: self.onSet,
+            GET_ACK: self.onAck,
+            SET_ACK: self.onAck,
+            GET_ALL: self.onGetAll,
+            GET_ALL_ACK: self.onGetAllAck,
+        }
         self.subscriber = node.create_subscription(ConfigurationInstruction, "/scr/configuration", self.onConfigurationInstruction, 100)
         self.publisher = node.create_publisher(ConfigurationInstruction, "/scr/configuration", 100)
 
@@ -25,7 +81,7 @@ class Configuration:
         return self.getIntFrom(self.id, address)
 
     def getIntFrom(self, device: str, address: str) -> int:
-        return int.from_bytes(self.cache[device][address], byteorder='big', signed=True)
+        return INT_FORMAT.unpack(self.cache[device][address])[0]
 
     def setInt(self, address: str, value: int) -> None:
         self.setIntTo(self.id, address, value)
@@ -33,19 +89,20 @@ class Configuration:
     def setIntTo(self, device: str, address: str, value: int) -> None:
         if device not in self.cache:
             self.cache[device] = {}
-        self.cache[device][address] = value.to_bytes(4, byteorder='big', signed=True)
+        data = INT_FORMAT.pack(value)
+        self.cache[device][address] = data
         instruction = ConfigurationInstruction()
         instruction.device = device
         instruction.opcode = SET_ACK
         instruction.address = address
-        instruction.data = self.cache[device][address]
+        instruction.data = data
         self.publisher.publish(instruction)
 
     def getFloat(self, address: str) -> float:
         return self.getFloatFrom(self.id, address)
 
     def getFloatFrom(self, device: str, address: str) -> float:
-        return struct.unpack('f', self.cache[device][address])[0]
+        return FLOAT_FORMAT.unpack(self.cache[device][address])[0]
 
     def setFloat(self, address: str, value: float) -> None:
         self.setFloatTo(self.id, address, value)
@@ -53,12 +110,13 @@ class Configuration:
     def setFloatTo(self, device: str, address: str, value: float) -> None:
         if device not in self.cache:
             self.cache[device] = {}
-        self.cache[device][address] = bytearray(struct.pack('f', value))
+        data = FLOAT_FORMAT.pack(value)
+        self.cache[device][address] = data
         instruction = ConfigurationInstruction()
         instruction.device = device
         instruction.opcode = SET_ACK
         instruction.address = address
-        instruction.data = self.cache[device][address]
+        instruction.data = data
         self.publisher.publish(instruction)
 
     def getBool(self, address: str) -> bool:
@@ -73,50 +131,68 @@ class Configuration:
     def setBoolTo(self, device: str, address: str, value: bool) -> None:
         if device not in self.cache:
             self.cache[device] = {}
-        self.cache[device][address] = bytes([value])
+        data = BOOL_TRUE if value else BOOL_FALSE
+        self.cache[device][address] = data
         instruction = ConfigurationInstruction()
         instruction.device = device
         instruction.opcode = SET_ACK
         instruction.address = address
-        instruction.data = self.cache[device][address]
+        instruction.data = data
         self.publisher.publish(instruction)
 
     def recache(self):
         self.cache = {}
+        self.cache[self.id] = {}
 
     def onConfigurationInstruction(self, instruction: ConfigurationInstruction):
-        amTarget = instruction.device == self.id
-
+        handler = self.handlers.get(instruction.opcode)
+        if handler is not None:
+            handler(instruction)
+
+    def onGet(self, instruction: ConfigurationInstruction):
+        if instruction.device != self.id:
+            return
+
+        response = ConfigurationInstruction()
+        response.device = self.id
+        response.opcode = GET_ACK
+        response.address = instruction.address
+        response.data = self.cache[self.id][instruction.address]
+        self.publisher.publish(response)
+
+    def onSet(self, instruction: ConfigurationInstruction):
+        if instruction.device != self.id:
+            return
+
+        self.cache[self.id][instruction.address] = instruction.data
+        response = ConfigurationInstruction()
+        response.device = self.id
+        response.opcode = SET_ACK
+        response.address = instruction.address
+        response.data = instruction.data
+        self.publisher.publish(response)
+        self.node.onConfigurationChanged(instruction.address)
+
+    def onAck(self, instruction: ConfigurationInstruction):
         if instruction.device not in self.cache:
             self.cache[instruction.device] = {}
+        self.cache[instruction.device][instruction.address] = instruction.data
+
+    def onGetAll(self, instruction: ConfigurationInstruction):
+        if instruction.device != self.id:
+            return
+
+        response = ConfigurationInstruction()
+        response.device = self.id
+        response.opcode = GET_ALL_ACK
+        response.data = packRegisters(self.cache[self.id])
+        self.publisher.publish(response)
 
-        if instruction.opcode == GET and amTarget:
-            response = ConfigurationInstruction()
-            response.device = self.id
-            response.opcode = GET_ACK
-            response.address = instruction.address
-            response.data = self.cache[instruction.device][instruction.address]
-            self.publisher.publish(response)
-
-        if instruction.opcode == SET and amTarget:
-            self.cache[instruction.device][instruction.address] = instruction.data
-            response = ConfigurationInstruction()
-            response.device = self.id
-            response.opcode = SET_ACK
-            response.address = instruction.address
-            response.data = self.cache[instruction.device][instruction.address]
-            self.publisher.publish(response)
-
-        if instruction.opcode == SET_ACK or instruction.opcode == GET_ACK:
-            if instruction.device not in self.cache:
-                self.cache[instruction.device] = {}
-            self.cache[instruction.device][instruction.address] = instruction.data
-
-        if instruction.opcode == GET_ALL and amTarget and self.id in self.cache:
-            for address in self.cache[self.id]:
-                response = ConfigurationInstruction()
-                response.device = self.id
-                response.opcode = GET_ACK
-                response.address = address
-                response.data = self.cache[self.id][address]
-                self.publisher.publish(response)
+    def onGetAllAck(self, instruction: ConfigurationInstruction):
+        registers = unpackRegisters(instruction.data)
+        if registers is None:
+            return
+
+        if instruction.device not in self.cache:
+            self.cache[instruction.device] = {}
+        self.cache[instruction.device].update(registers)
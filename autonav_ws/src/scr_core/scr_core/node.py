@@ -4,6 +4,7 @@ from scr_msgs.msg import DeviceState, SystemState, Log
 from scr_core.configuration import Configuration
 from scr_core.performance import Performance
 from rclpy.node import Node as ROSNode
+from rclpy.callback_groups import ReentrantCallbackGroup
 from std_msgs.msg import Empty
 import time
 import signal
@@ -21,8 +22,10 @@ class Node(ROSNode):
         super().__init__(node_name)
         self.id = node_name
 
+        # Callbacks that only store the latest message can run alongside anything else
+        self.reentrantGroup = ReentrantCallbackGroup()
+
         # State System
-        self.config = Configuration(node_name, self)
         self.deviceStateSubscriber = self.create_subscription(DeviceState, "/scr/state/device", self.onDeviceState, 100)
         self.systemStateSubscriber = self.create_subscription(SystemState, "/scr/state/system", self.onSystemState, 100)
         self.deviceStateClient = self.create_client(SetDeviceState, "/scr/state/set_device_state")
@@ -30,6 +33,7 @@ class Node(ROSNode):
         self.resetSubscriber = self.create_subscription(Empty, "/scr/reset", self.onResetInternal, 100)
         self.resetPublisher = self.create_publisher(Empty, "/scr/reset", 100)
         self.logPublisher = self.create_publisher(Log, "/scr/logging", 100)
+        self.logName = self.get_name()
 
         # Configuration
         self.config = Configuration(self.id, self)
@@ -45,6 +49,9 @@ class Node(ROSNode):
     def onReset(self):
         pass
 
+    def onConfigurationChanged(self, address: str):
+        pass
+
     def onResetInternal(self, _):
         self.onReset()
 
@@ -56,7 +63,7 @@ class Node(ROSNode):
     
     def log(self, message: str):
         log = Log()
-        log.node = self.get_name()
+        log.node = self.logName
         log.data = message
         self.logPublisher.publish(log)
 
@@ -354,14 +354,60 @@ namespace SCR
 
 		if (instruction->opcode == Opcode::GET_ALL && amTarget)
 		{
+			// Reply with every register in one message, each packed as [address length:u16][address][data length:u16][data]
+			scr_msgs::msg::ConfigurationInstruction response;
+			response.device = instruction->device;
+			response.opcode = Opcode::GET_ALL_ACK;
 			for (auto const& [address, bytes] : cache[instruction->device])
 			{
-				scr_msgs::msg::ConfigurationInstruction response;
-				response.device = instruction->device;
-				response.opcode = Opcode::GET_ACK;
-				response.address = address;
-				response.data = bytes;
-				configPublisher->publish(response);
+				response.data.push_back((address.size() >> 8) & 0xFF);
+				response.data.push_back(address.size() & 0xFF);
+				response.data.insert(response.data.end(), address.begin(), address.end());
+				response.data.push_back((bytes.size() >> 8) & 0xFF);
+				response.data.push_back(bytes.size() & 0xFF);
+				response.data.insert(response.data.end(), bytes.begin(), bytes.end());
+			}
+			configPublisher->publish(response);
+		}
+
+		if (instruction->opcode == Opcode::GET_ALL_ACK)
+		{
+			// Decode into a scratch map first so a malformed payload is dropped entirely
+			const auto& data = instruction->data;
+			std::map<std::string, std::vector<uint8_t>> registers;
+			size_t offset = 0;
+			while (offset < data.size())
+			{
+				if (data.size() - offset < 2)
+				{
+					return;
+				}
+				size_t length = data[offset] << 8 | data[offset + 1];
+				offset += 2;
+				if (data.size() - offset < length)
+				{
+					return;
+				}
+				std::string address(data.begin() + offset, data.begin() + offset + length);
+				offset += length;
+
+				if (data.size() - offset < 2)
+				{
+					return;
+				}
+				length = data[offset] << 8 | data[offset + 1];
+				offset += 2;
+				if (data.size() - offset < length)
+				{
+					return;
+				}
+				registers[address] = std::vector<uint8_t>(data.begin() + offset, data.begin() + offset + length);
+				offset += length;
+			}
+
+			for (auto const& [address, bytes] : registers)
+			{
+				cache[instruction->device][address] = bytes;
 			}
 		}
 	}
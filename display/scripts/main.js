@@ -396,6 +396,74 @@ $(document).ready(function () {
         }
     }, 10);
 
+    // GET_ALL_ACK payload, repeated per register: [address length:u16][address][data length:u16][data]
+    function unpackRegisters(data) {
+        const registers = {};
+        let offset = 0;
+        while (offset < data.length) {
+            if (offset + 2 > data.length) {
+                return null;
+            }
+            let length = data[offset] << 8 | data[offset + 1];
+            offset += 2;
+            if (offset + length > data.length) {
+                return null;
+            }
+            const address = new TextDecoder().decode(new Uint8Array(data.slice(offset, offset + length)));
+            offset += length;
+
+            if (offset + 2 > data.length) {
+                return null;
+            }
+            length = data[offset] << 8 | data[offset + 1];
+            offset += 2;
+            if (offset + length > data.length) {
+                return null;
+            }
+            registers[address] = data.slice(offset, offset + length);
+            offset += length;
+        }
+        return registers;
+    }
+
+    function renderConfiguration() {
+        const configElement = $("#configuration");
+        configElement.empty();
+
+        for (const deviceId in config) {
+            const deviceConfig = config[deviceId];
+            const title = addressKeys[deviceId]["internal_title"];
+            const deviceElement = $(`<div class="card" style="margin-bottom: 10px;"></div>`);
+            deviceElement.append(`<div class="card-header"><h5>${title}</h5></div>`);
+            const deviceBody = $(`<div class="card-body"></div>`);
+            deviceElement.append(deviceBody);
+
+            for (const address of Object.keys(deviceConfig).sort()) {
+                const data = deviceConfig[address];
+                const type = addressKeys[deviceId][address];
+                if (type == undefined) {
+                    const alert = $(`<div class="alert alert-warning" role="alert">Unknown Address: ${address}</div>`);
+                    deviceBody.append(alert);
+                    continue;
+                }
+
+                const inputElement = generateElementForConfiguration(data, type, deviceId, address);
+                deviceBody.append(inputElement);
+            }
+
+            for (const address in addressKeys[deviceId]) {
+                if (address in deviceConfig || address == "internal_title") {
+                    continue;
+                }
+
+                const alert = $(`<div class="alert alert-danger" role="alert">Unknown Address: ${address}</div>`);
+                deviceBody.append(alert);
+            }
+
+            configElement.append(deviceElement);
+        }
+    }
+
     function onTopicData(topic, msg) {
         const { iterator } = msg;
         if (iterator != undefined && iterators.includes(iterator)) {
@@ -448,42 +516,21 @@ $(document).ready(function () {
                 }
 
                 config[device][address] = data;
+                renderConfiguration();
+            }
 
-                const configElement = $("#configuration");
-                configElement.empty();
-
-                for (const deviceId in config) {
-                    const deviceConfig = config[deviceId];
-                    const title = addressKeys[deviceId]["internal_title"];
-                    const deviceElement = $(`<div class="card" style="margin-bottom: 10px;"></div>`);
-                    deviceElement.append(`<div class="card-header"><h5>${title}</h5></div>`);
-                    const deviceBody = $(`<div class="card-body"></div>`);
-                    deviceElement.append(deviceBody);
-
-                    for (const address of Object.keys(deviceConfig).sort()) {
-                        const data = deviceConfig[address];
-                        const type = addressKeys[deviceId][address];
-                        if (type == undefined) {
-                            const alert = $(`<div class="alert alert-warning" role="alert">Unknown Address: ${address}</div>`);
-                            deviceBody.append(alert);
-                            continue;
-                        }
-
-                        const inputElement = generateElementForConfiguration(data, type, deviceId, address);
-                        deviceBody.append(inputElement);
-                    }
-
-                    for (const address in addressKeys[deviceId]) {
-                        if (address in deviceConfig || address == "internal_title") {
-                            continue;
-                        }
-
-                        const alert = $(`<div class="alert alert-danger" role="alert">Unknown Address: ${address}</div>`);
-                        deviceBody.append(alert);
-                    }
+            if (opcode == 5) {
+                const registers = unpackRegisters(data);
+                if (registers == null) {
+                    return;
+                }
 
-                    configElement.append(deviceElement);
+                if (!(device in config)) {
+                    config[device] = {};
                 }
+
+                Object.assign(config[device], registers);
+                renderConfiguration();
             }
             return;
         }
@@ -29,6 +29,8 @@ sudo apt install libglfw3-dev libglew-dev -y
 sudo apt install python3-pip -y
 pip3 install python-can[serial]
 pip3 install websockets
+# Pinned so pip keeps the NumPy 1.21 shipped with Humble (numba 0.56.4 needs numpy<1.24)
+pip3 install numba==0.56.4 llvmlite==0.39.1
 
 # Copy the udev rules to the correct location
 sudo cp autonav.rules /etc/udev/rules.d/autonav.rules
@@ -2,26 +2,12 @@ import numpy as np
 from filter import PFilter
 from typies import Feedback, GPS
 import matplotlib.pyplot as plt
-import math
+import csv
 
 MAIN_FILE = "log.csv"
 LAT_METER_CONV = 110944.21
 LON_METER_CONV = 81978.2
 
-data = []
-with open(MAIN_FILE, "r") as f:
-	for line in f.readlines():
-		line = line.strip()
-		bits = line.split(",")
-		for i in range(len(bits)):
-			bits[i] = bits[i].strip()
-		if line == "" or bits[0] == "timestamp":
-			continue
-		
-		type = bits[1]
-		if type == "ENTRY_GPS" or type == "ENTRY_FEEDBACK":
-			data.append(bits)
-
 plt.figure(figsize=(15,15))
 
 newpf_poses = []
@@ -31,44 +17,49 @@ print("Starting")
 
 pf = PFilter()
 first_gps = None
-for row in data:
-	if row[1] == "ENTRY_FEEDBACK":
-		feedback = Feedback(float(row[2]), float(row[3]), float(row[4]))
-		if float(row[2]) == 0 and float(row[3]) == 0 and float(row[4]) == 0:
+with open(MAIN_FILE, "r", newline="") as f:
+	# Stream rows straight into the filter; rows have a varying number of columns
+	for row in csv.reader(f, skipinitialspace=True):
+		if len(row) < 2:
 			continue
-		average = pf.feedback(feedback)
-		if first_gps is not None:
-			mtr_x = first_gps.latitude + average[0] / LAT_METER_CONV
-			mtr_y = first_gps.longitude - average[1] / LON_METER_CONV
-			newpf_poses.append([mtr_x, mtr_y, average[2]])
 
-	else:
-		gps = GPS(float(row[2]), float(row[3]))
-		if gps.latitude == 0 or gps.longitude == 0:
-			continue
-		
-		if first_gps is None:
-			first_gps = gps
+		type = row[1]
+		if type == "ENTRY_FEEDBACK":
+			delta_x, delta_y, delta_theta = float(row[2]), float(row[3]), float(row[4])
+			if delta_x == 0 and delta_y == 0 and delta_theta == 0:
+				continue
+			average = pf.feedback(Feedback(delta_x, delta_y, delta_theta))
+			if first_gps is not None:
+				mtr_x = first_gps.latitude + average[0] / LAT_METER_CONV
+				mtr_y = first_gps.longitude - average[1] / LON_METER_CONV
+				newpf_poses.append([mtr_x, mtr_y, average[2]])
+
+		elif type == "ENTRY_GPS":
+			gps = GPS(float(row[2]), float(row[3]))
+			if gps.latitude == 0 or gps.longitude == 0:
+				continue
+			
+			if first_gps is None:
+				first_gps = gps
    
-		pf.gps(gps)
-		rawgps_poses.append([gps.latitude, gps.longitude])
+			pf.gps(gps)
+			rawgps_poses.append([gps.latitude, gps.longitude])
 
 print("ending")
 
 # Filter out any [0, 0] points
-newpf_poses = [x for x in newpf_poses if x[0] != 0 and x[1] != 0]
-rawgps_poses = [x for x in rawgps_poses if x[0] != 0 and x[1] != 0]
+newpf_poses = np.asarray(newpf_poses, dtype=float).reshape(-1, 3)
+rawgps_poses = np.asarray(rawgps_poses, dtype=float).reshape(-1, 2)
+newpf_poses = newpf_poses[(newpf_poses[:, 0] != 0) & (newpf_poses[:, 1] != 0)]
+rawgps_poses = rawgps_poses[(rawgps_poses[:, 0] != 0) & (rawgps_poses[:, 1] != 0)]
 
 print(str(len(newpf_poses)))
 
-# Draw the pf path with quivers
-for i in range(len(newpf_poses)):
-	pose = newpf_poses[i]
-	theta = pose[2]
-	if i % 10 == 0:
-		plt.quiver(pose[0], pose[1], math.cos(theta), math.sin(theta), color="red", scale=10)
+# Draw every 10th pf pose as a quiver, all in a single artist
+arrows = newpf_poses[::10]
+plt.quiver(arrows[:, 0], arrows[:, 1], np.cos(arrows[:, 2]), np.sin(arrows[:, 2]), color="red", scale=10)
 
-plt.plot([x[0] for x in rawgps_poses], [x[1] for x in rawgps_poses], label="Raw GPS")
-plt.plot([x[0] for x in newpf_poses], [x[1] for x in newpf_poses], label="PF")
+plt.plot(rawgps_poses[:, 0], rawgps_poses[:, 1], label="Raw GPS")
+plt.plot(newpf_poses[:, 0], newpf_poses[:, 1], label="PF")
 plt.legend()
 plt.show()